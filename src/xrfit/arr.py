@@ -35,6 +35,8 @@ def _get_arr(
 
 @xr.register_dataarray_accessor("get_arr")
 class ArrAccessor(DataArrayAccessor):
+    __slots__ = ()
+
     def _get_x(self):
         return self._obj[0].item().userkws["x"]
 
@@ -8,6 +8,8 @@ from xrfit.base import DataArrayAccessor
 
 @xr.register_dataarray_accessor("assess")
 class AccessAccessor(DataArrayAccessor):
+    __slots__ = ()
+
     def fit_stats(
         self,
         attr_name: Literal[
@@ -2,5 +2,7 @@ import xarray as xr
 
 
 class DataArrayAccessor:
+    __slots__ = ("_obj",)
+
     def __init__(self, xarr: xr.DataArray) -> None:
         self._obj = xarr
@@ -6,6 +6,8 @@ from xrfit.base import DataArrayAccessor
 
 @xr.register_dataarray_accessor("bin")
 class BinAccessor(DataArrayAccessor):
+    __slots__ = ()
+
     def __call__(self, **dim_multipliers):
         dim_dict = {}
 
@@ -308,6 +308,8 @@ class MainWindow(QWidget):
 
 @xr.register_dataarray_accessor("display")
 class DisplayAccessor(DataArrayAccessor):
+    __slots__ = ()
+
     def __init__(self, xarray_obj):
         super().__init__(xarray_obj)
 
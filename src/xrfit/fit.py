@@ -40,6 +40,8 @@ def _generalized_guess(model, data, x):
 
 @xr.register_dataarray_accessor("fit")
 class FitAccessor(DataArrayAccessor):
+    __slots__ = ()
+
     def guess(
         self,
         model: lf.model.Model,
@@ -1,55 +1,164 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
 import lmfit as lf
 import numpy as np
+import numpy.typing as npt
 import xarray as xr
-from scipy.ndimage import gaussian_filter
+from scipy.ndimage import gaussian_filter1d
 
 from xrfit.base import DataArrayAccessor
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
 
-def _get(
+
+def _map_cells(
+    func: Callable[[Any], Any],
+    arr: np.ndarray,
+    n_workers: int | None = None,
+    chunk_size: int = 1024,
+) -> list:
+    # cells are independent ModelResult objects, so chunks can run in threads
+    cells = arr.reshape(-1)
+    if n_workers is None or n_workers <= 1 or cells.size <= chunk_size:
+        return [func(cell) for cell in cells]
+    chunks = [cells[i : i + chunk_size] for i in range(0, cells.size, chunk_size)]
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        results = executor.map(lambda chunk: [func(cell) for cell in chunk], chunks)
+        return [res for chunk_res in results for res in chunk_res]
+
+
+def _match_keys(
     data: lf.model.ModelResult,
     params_name: str = "center",
+) -> list[str]:
+    # every cell shares the same model, so the matching keys are resolved once
+    return [key for key in data.params if key.endswith(params_name)]
+
+
+def _get(
+    data: lf.model.ModelResult,
+    keys: list[str],
     params_attr: str = "value",
 ):
     params = data.params
-    return np.array(
-        [
-            getattr(params[key], params_attr)
-            for key in params
-            if key.endswith(params_name)
-        ]
-    )
+    return np.array([getattr(params[key], params_attr) for key in keys])
 
 
 # TODO currently set value only.
 def _assign(
     data: lf.model.ModelResult,
     params_value_new: xr.DataArray,
-    params_name: str = "center",
+    keys: list[str],
 ):
     params = data.params
-    pars = [key for key in params if key.endswith(params_name)]
-    for i, par in enumerate(pars):
-        data.params[par].set(value=params_value_new[i], min=-np.inf, max=np.inf)
+    current = np.fromiter((params[key].value for key in keys), float, len(keys))
+    if np.array_equal(current, params_value_new) and all(
+        params[key].min == -np.inf
+        and params[key].max == np.inf
+        and params[key].expr is None
+        and params[key].init_value == params[key].value
+        for key in keys
+    ):
+        # already in the state a write would leave, e.g. a cell sort left in order
+        return data
+    for i, key in enumerate(keys):
+        param = params[key]
+        if param.expr is not None:
+            # set() is needed to clear the constraint expression
+            param.set(value=params_value_new[i], min=-np.inf, max=np.inf)
+            continue
+        param.min = -np.inf
+        param.max = np.inf
+        param.value = param.init_value = params_value_new[i]
     return data
 
 
+def _get_block(
+    block: np.ndarray,
+    keys: list[str],
+    params_attr: str = "value",
+    dtype: npt.DTypeLike = float,
+) -> np.ndarray:
+    out = np.empty((*block.shape, len(keys)), dtype=dtype)
+    out_flat = out.reshape(block.size, len(keys))
+    values = _map_cells(lambda x: _get(x, keys, params_attr), block)
+    for i, value in enumerate(values):
+        out_flat[i] = value
+    return out
+
+
+def _bulk_get(
+    arr: np.ndarray,
+    params_name: str = "center",
+    params_attr: str = "value",
+) -> np.ndarray:
+    keys = _match_keys(arr.flat[0], params_name)
+    sample = _get(arr.flat[0], keys, params_attr)
+    return _get_block(arr, keys, params_attr, sample.dtype)
+
+
+def _bulk_assign(
+    arr: np.ndarray,
+    params_value_new: np.ndarray,
+    keys: list[str],
+) -> None:
+    values = np.broadcast_to(params_value_new, (*arr.shape, len(keys)))
+    values_flat = values.reshape(arr.size, len(keys))
+    for modelresult, row in zip(arr.flat, values_flat, strict=True):
+        _assign(modelresult, row, keys)
+
+
+def _bounds_kernel_loop(
+    vals: np.ndarray,
+    mins: np.ndarray,
+    maxs: np.ndarray,
+    bound_ratio: float,
+    bound_tol: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    lo = mins.copy()
+    hi = maxs.copy()
+    for i in range(vals.size):
+        val = vals[i]
+        abs_val = abs(val)
+        if mins[i] <= val:
+            lo[i] = -bound_tol if abs_val <= bound_tol else val - bound_ratio * abs_val
+        if maxs[i] >= val:
+            hi[i] = bound_tol if abs_val <= bound_tol else val + bound_ratio * abs_val
+    return lo, hi
+
+
+# per-cell arrays hold only a handful of params, so a scalar loop beats
+# np.where temporaries; numba compiles the same loop when it is installed.
+# no fastmath: current bounds are routinely +-inf
+_bounds_kernel = (
+    _bounds_kernel_loop
+    if njit is None
+    else njit(cache=True, nogil=True)(_bounds_kernel_loop)
+)
+
+
 def _set_bounds(
     modelresult: lf.model.ModelResult,
     bound_ratio: float = 0.1,
     bound_tol: float = 1e-3,
 ):
-    for param_name, param_value in modelresult.params.items():
-        if param_value.vary:
-            param_min = param_value - bound_ratio * abs(param_value)
-            param_max = param_value + bound_ratio * abs(param_value)
-            if np.abs(param_value) <= bound_tol:
-                param_min = -bound_tol
-                param_max = bound_tol
-            if param_value.min <= param_value:
-                modelresult.params.get(param_name).set(min=param_min)
-            if param_value.max >= param_value:
-                modelresult.params.get(param_name).set(max=param_max)
+    params = modelresult.params
+    names = [name for name, param in params.items() if param.vary]
+    if not names:
+        return modelresult
+    vals = np.fromiter((params[name].value for name in names), float, len(names))
+    mins = np.fromiter((params[name].min for name in names), float, len(names))
+    maxs = np.fromiter((params[name].max for name in names), float, len(names))
+    param_min, param_max = _bounds_kernel(vals, mins, maxs, bound_ratio, bound_tol)
+    for name, lo, hi in zip(names, param_min, param_max, strict=True):
+        param = params[name]
+        param.min = lo
+        param.max = hi
     return modelresult
 
 
@@ -66,7 +175,7 @@ class ParamsAccessor(DataArrayAccessor):
     set_bounds(bound_ratio: float = 0.1) -> xr.DataArray
         Sets the bounds for the parameters based on a given ratio.
 
-    smoothen(param_name: str = "center", sigma: int = 5) -> xr.DataArray
+    smoothen(param_name: str = "center", sigma: int = 5, truncate: float = 3.0) -> xr.DataArray
         Applies smoothing to the specified parameter.
 
     sort(target_param_name: str = "center", params_name: list | None = None) -> xr.DataArray
@@ -79,15 +188,17 @@ class ParamsAccessor(DataArrayAccessor):
         Sets the specified parameter attribute to a new value.
     """
 
-    def parse(
-        self,
-    ) -> xr.DataArray:
-        return xr.apply_ufunc(
-            lambda x: x.params,
-            self._obj,
-            vectorize=True,
-            dask="parallelized",
-            output_dtypes=[object],
+    __slots__ = ()
+
+    def parse(self) -> xr.DataArray:
+        arr = self._obj.values
+        out = np.empty(arr.shape, dtype=object)
+        out_flat = out.reshape(-1)
+        parsed = _map_cells(lambda x: x.params, arr)
+        for i, params in enumerate(parsed):
+            out_flat[i] = params
+        return xr.DataArray(
+            out, dims=self._obj.dims, coords=self._obj.coords, name=self._obj.name
         )
 
     def set_bounds(
@@ -97,20 +208,21 @@ class ParamsAccessor(DataArrayAccessor):
         index_dict: dict | None = None,
     ) -> xr.DataArray:
         if index_dict is None:
-            return xr.apply_ufunc(
-                _set_bounds,
-                self._obj,
-                kwargs={
-                    "bound_ratio": bound_ratio,
-                    "bound_tol": bound_tol,
-                },
-                vectorize=True,
-                dask="parallelized",
+            arr = self._obj.values
+            out = np.empty(arr.shape, dtype=object)
+            out_flat = out.reshape(-1)
+            bounded = _map_cells(
+                lambda x: _set_bounds(x, bound_ratio=bound_ratio, bound_tol=bound_tol),
+                arr,
+            )
+            for i, modelresult in enumerate(bounded):
+                out_flat[i] = modelresult
+            return xr.DataArray(
+                out, dims=self._obj.dims, coords=self._obj.coords, name=self._obj.name
             )
-        item = self._obj.isel(index_dict).item()
-        index_dict = {k: self._obj.coords[k][v].item() for k, v in index_dict.items()}
-        self._obj.loc[index_dict] = _set_bounds(
-            item,
+        # _set_bounds updates the ModelResult in place, no write-back needed
+        _set_bounds(
+            self._obj.isel(index_dict).item(),
             bound_ratio=bound_ratio,
             bound_tol=bound_tol,
         )
@@ -120,14 +232,21 @@ class ParamsAccessor(DataArrayAccessor):
         self,
         param_name: str = "center",
         sigma: int = 5,
+        truncate: float = 3.0,
     ) -> xr.DataArray:
-        param = self._obj.params.get(param_name)
-        smoothing_sigma = [
-            sigma if i < param.ndim - 1 else 0 for i in range(param.ndim)
-        ]
-
-        param_smooth = gaussian_filter(param, sigma=smoothing_sigma)
-        self._obj.params.assign(param_smooth, param_name)
+        arr = self._obj.values
+        param = _bulk_get(arr, param_name)
+        # smooth along the grid axes only, never across params_dim
+        param_smooth = np.ascontiguousarray(param, dtype=float)
+        for axis in range(param.ndim - 1):
+            param_smooth = gaussian_filter1d(
+                param_smooth,
+                sigma=sigma,
+                axis=axis,
+                mode="nearest",
+                truncate=truncate,
+            )
+        _bulk_assign(arr, param_smooth, _match_keys(arr.flat[0], param_name))
         return self._obj
 
     def sort(
@@ -137,12 +256,31 @@ class ParamsAccessor(DataArrayAccessor):
     ) -> xr.DataArray:
         if params_name is None:
             params_name = ["center"]
-        param_to_sortby = self._obj.params.get(target_param_name)
-        sorted_indices = param_to_sortby.argsort(axis=-1)
-        for param_name in params_name:
-            param = self._obj.params.get(param_name)
-            sorted_param = param.isel(params_dim=sorted_indices)
-            self._obj.params.assign(sorted_param, param_name)
+        if not params_name:
+            return self._obj
+        arr = self._obj.values
+        sample = arr.flat[0]
+        target_keys = _match_keys(sample, target_param_name)
+        keys_list = [_match_keys(sample, name) for name in params_name]
+        # only the target and requested columns are read
+        names = list(
+            dict.fromkeys(key for keys in [target_keys, *keys_list] for key in keys)
+        )
+        values = _get_block(arr, names)
+        col = {name: i for i, name in enumerate(names)}
+        sorted_indices = np.argsort(
+            values[..., [col[key] for key in target_keys]], axis=-1
+        )
+        sync_names: list[str] = []
+        sync_values = []
+        for keys in keys_list:
+            sync_names.extend(keys)
+            sync_values.append(
+                np.take_along_axis(
+                    values[..., [col[key] for key in keys]], sorted_indices, axis=-1
+                )
+            )
+        _bulk_assign(arr, np.concatenate(sync_values, axis=-1), sync_names)
         return self._obj
 
     def get(
@@ -150,32 +288,54 @@ class ParamsAccessor(DataArrayAccessor):
         params_name: str = "center",
         params_attr: str = "value",
     ) -> xr.DataArray:
-        return xr.apply_ufunc(
-            _get,
-            self._obj,
-            kwargs={
-                "params_name": params_name,
-                "params_attr": params_attr,
-            },
-            input_core_dims=[[]],
-            output_core_dims=[["params_dim"]],
-            vectorize=True,
+        if self._obj.ndim == 0:
+            modelresult = self._obj.item()
+            keys = _match_keys(modelresult, params_name)
+            return xr.DataArray(
+                _get(modelresult, keys, params_attr),
+                dims=("params_dim",),
+                coords=self._obj.coords,
+                name=self._obj.name,
+            )
+        if self._obj.chunks is not None:
+            # chunked grids are mapped block-wise so dask can run blocks in parallel
+            modelresult = self._obj[(0,) * self._obj.ndim].values.item()
+            keys = _match_keys(modelresult, params_name)
+            sample = _get(modelresult, keys, params_attr)
+            return xr.apply_ufunc(
+                _get_block,
+                self._obj,
+                kwargs={
+                    "keys": keys,
+                    "params_attr": params_attr,
+                    "dtype": sample.dtype,
+                },
+                input_core_dims=[[]],
+                output_core_dims=[["params_dim"]],
+                dask="parallelized",
+                output_dtypes=[sample.dtype],
+                dask_gufunc_kwargs={"output_sizes": {"params_dim": len(keys)}},
+            )
+        return xr.DataArray(
+            _bulk_get(self._obj.values, params_name, params_attr),
+            dims=(*self._obj.dims, "params_dim"),
+            coords=self._obj.coords,
+            name=self._obj.name,
         )
 
     def assign(
         self,
-        params_value_new: xr.DataArray,
+        params_value_new: xr.DataArray | np.ndarray,
         params_name: str = "center",
         # params_attr: str = "value",
     ) -> xr.DataArray:
-        return xr.apply_ufunc(
-            _assign,
-            self._obj,
-            params_value_new,
-            kwargs={
-                "params_name": params_name,
-                # "params_attr": params_attr,
-            },
-            input_core_dims=[[], ["params_dim"]],
-            vectorize=True,
-        )
+        if isinstance(params_value_new, xr.DataArray):
+            xr.align(self._obj, params_value_new, join="exact")
+            params_value_new = (
+                params_value_new.broadcast_like(self._obj)
+                .transpose(*self._obj.dims, "params_dim")
+                .values
+            )
+        arr = self._obj.values
+        _bulk_assign(arr, params_value_new, _match_keys(arr.flat[0], params_name))
+        return self._obj
@@ -1,7 +1,12 @@
+import importlib.util
+
 import lmfit as lf
 import numpy as np
 import pytest
 import xarray as xr
+from scipy.ndimage import gaussian_filter1d
+
+from xrfit.params import _bounds_kernel, _bounds_kernel_loop, _map_cells
 
 
 @pytest.fixture
@@ -20,12 +25,60 @@ def data_array():
     return xr.DataArray([result, result2], coords={"z": z}, dims=["z"])
 
 
+@pytest.fixture
+def two_peak_array():
+    rng = np.random.default_rng(seed=0)
+    x = np.linspace(-10, 10, 200)
+    model = lf.models.LorentzianModel(prefix="p0_") + lf.models.LorentzianModel(
+        prefix="p1_"
+    )
+    # peak at -3 has amplitude 1, peak at 3 has amplitude 2
+    y = model.eval(
+        x=x,
+        p0_amplitude=1,
+        p0_center=-3,
+        p0_sigma=0.5,
+        p1_amplitude=2,
+        p1_center=3,
+        p1_sigma=0.5,
+    )
+    results = []
+    for i in range(4):
+        # odd cells start with the prefixes swapped, so they fit out of order
+        c0, c1 = (3, -3) if i % 2 else (-3, 3)
+        params = model.make_params(
+            p0_amplitude=1, p0_center=c0, p0_sigma=0.5,
+            p1_amplitude=1, p1_center=c1, p1_sigma=0.5,
+        )  # fmt: skip
+        noisy = y + rng.normal(size=x.size) * 0.01
+        results.append(model.fit(noisy, params, x=x))
+    return xr.DataArray(results, coords={"z": np.arange(4)}, dims=["z"])
+
+
 def test_get(data_array):
     result = data_array.params.get(params_name="amplitude")
     assert result.shape == (2, 1)
     assert np.all(result >= 0)  # Assuming amplitude is non-negative
 
 
+def test_name_preserved(data_array):
+    data_array = data_array.rename("fr")
+    assert data_array.params.get(params_name="amplitude").name == "fr"
+    assert data_array[0].params.get(params_name="amplitude").name == "fr"
+    assert data_array.params.parse().name == "fr"
+    assert data_array.params.set_bounds().name == "fr"
+
+
+def test_get_no_match(data_array):
+    result = data_array.params.get(params_name="nomatch")
+    assert result.shape == (2, 0)
+
+
+def test_assign_no_match(data_array):
+    data_array.params.assign(np.zeros((2, 0)), params_name="nomatch")
+    data_array.params.sort("nomatch", ["nomatch"])
+
+
 def test_assign(data_array):
     z = np.linspace(0, 1, 2)
     params_dim = ["amplitude"]
@@ -50,14 +103,119 @@ def test_set_bounds(data_array):
     assert result.shape == (2, 1)  # Check if values are unchanged
 
 
+def test_set_bounds_index(data_array):
+    data_array.params.set_bounds(bound_ratio=0.2, index_dict={"z": 1})
+    param = data_array[1].item().params["amplitude"]
+    assert param.min == param.value - 0.2 * abs(param.value)
+    assert data_array[0].item().params["amplitude"].max == np.inf
+
+
+def test_set_bounds_index_partial(data_array):
+    expanded = data_array.expand_dims("b", axis=-1)
+    expanded.params.set_bounds(bound_ratio=0.2, index_dict={"z": 0})
+    param = data_array[0].item().params["amplitude"]
+    assert param.min == param.value - 0.2 * abs(param.value)
+    with pytest.raises(ValueError, match="do not exist"):
+        expanded.params.set_bounds(index_dict={"z": 0, "nodim": 0})
+
+
 def test_smoothen(data_array):
     data_array.params.smoothen(param_name="amplitude", sigma=1)
     result = data_array.params.get(params_name="amplitude")
     assert result is not None  # Check if smoothing was applied
 
 
+@pytest.mark.parametrize("truncate", [3.0, 1.0])
+def test_smoothen_reference(two_peak_array, truncate):
+    grid = xr.DataArray(two_peak_array.values.reshape(2, 2), dims=["a", "b"])
+    expected = grid.params.get(params_name="center").values
+    for axis in range(grid.ndim):  # grid axes only, never params_dim
+        expected = gaussian_filter1d(
+            expected, sigma=1, axis=axis, mode="nearest", truncate=truncate
+        )
+    kws = {} if truncate == 3.0 else {"truncate": truncate}
+    grid.params.smoothen(param_name="center", sigma=1, **kws)
+    result = grid.params.get(params_name="center")
+    np.testing.assert_allclose(result.values, expected)
+
+
 def test_sort(data_array):
     data_array.params.sort("amplitude")
     result = data_array.params.get(params_name="amplitude")
     assert result.size > 0  # Check if result is not empty
     assert result.shape == (2, 1)  # Check if sorting was applied
+
+
+def test_sort_two_peaks(two_peak_array):
+    center = two_peak_array.params.get(params_name="center")
+    assert np.any(center[:, 0] > center[:, 1])  # some cells are out of order
+
+    two_peak_array.params.sort("center", ["center", "amplitude", "sigma"])
+    center = two_peak_array.params.get(params_name="center")
+    amplitude = two_peak_array.params.get(params_name="amplitude")
+    assert np.all(np.diff(center.values, axis=-1) > 0)
+    np.testing.assert_allclose(center.values, [[-3, 3]] * 4, atol=1e-2)
+    np.testing.assert_allclose(amplitude.values, [[1, 2]] * 4, rtol=5e-2)
+
+
+def test_map_cells_threaded(data_array):
+    serial = _map_cells(lambda x: x.params, data_array.values)
+    threaded = _map_cells(
+        lambda x: x.params, data_array.values, n_workers=2, chunk_size=1
+    )
+    assert all(a is b for a, b in zip(serial, threaded, strict=True))
+
+    # more cells than the default chunk_size, so the pool is actually used
+    cells = np.empty(2100, dtype=object)
+    cells[:] = [data_array[i % 2].item() for i in range(cells.size)]
+    serial = _map_cells(lambda x: x.params["amplitude"].value, cells)
+    threaded = _map_cells(lambda x: x.params["amplitude"].value, cells, n_workers=2)
+    assert threaded == serial
+
+
+def test_bounds_kernel():
+    if importlib.util.find_spec("numba") is not None:
+        assert _bounds_kernel is not _bounds_kernel_loop  # jitted
+    vals = np.array([1.0, -2.0, 1e-4, 5.0, 3.0])
+    mins = np.array([-np.inf, -np.inf, -np.inf, 6.0, -np.inf])
+    maxs = np.array([np.inf, np.inf, np.inf, np.inf, 2.0])
+    for kernel in (_bounds_kernel, _bounds_kernel_loop):
+        lo, hi = kernel(vals, mins, maxs, 0.5, 1e-3)
+        np.testing.assert_allclose(lo, [0.5, -3.0, -1e-3, 6.0, 1.5])
+        np.testing.assert_allclose(hi, [1.5, -1.0, 1e-3, 7.5, 2.0])
+
+
+def test_get_scalar(data_array):
+    result = data_array[0].params.get(params_name="amplitude")
+    assert result.dims == ("params_dim",)
+    assert result.shape == (1,)
+    assert result.item() == data_array[0].item().params["amplitude"].value
+
+
+def test_get_dask(data_array):
+    pytest.importorskip("dask")
+    expected = data_array.params.get(params_name="amplitude")
+    result = data_array.chunk({"z": 1}).params.get(params_name="amplitude")
+    assert result.chunks is not None
+    np.testing.assert_array_equal(result.values, expected.values)
+
+
+def test_assign_unchanged(data_array):
+    # fitted cells are unbounded in amplitude but keep the guess as init_value
+    init = data_array.params.get(params_name="amplitude", params_attr="init_value")
+    current = data_array.params.get(params_name="amplitude")
+    assert np.all(init != current)
+    data_array.params.assign(current, params_name="amplitude")
+    result_init = data_array.params.get(
+        params_name="amplitude", params_attr="init_value"
+    )
+    np.testing.assert_array_equal(result_init.values, current.values)
+
+    data_array.params.set_bounds(bound_ratio=0.2)
+    data_array.params.assign(current, params_name="amplitude")
+    result = data_array.params.get(params_name="amplitude")
+    result_min = data_array.params.get(params_name="amplitude", params_attr="min")
+    result_max = data_array.params.get(params_name="amplitude", params_attr="max")
+    np.testing.assert_array_equal(result.values, current.values)
+    assert np.all(result_min == -np.inf)
+    assert np.all(result_max == np.inf)